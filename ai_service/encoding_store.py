@@ -0,0 +1,141 @@
+"""
+Consolidated on-disk store for face encodings
+
+All vectors live in a single float32 (N, 128) encodings.npy that is
+memory-mapped read-only, with a users.json index mapping user_id to its row
+plus enrollment metadata. Lookups are zero-copy views backed by the OS page
+cache, bulk startup load is two opens instead of N, and the matrix is
+already laid out for batch 1:N scans. Writes rename fresh copies of both
+files into place; enrollment is rare enough that this beats per-user files.
+
+The service runs multiple gunicorn workers against the same directory, so
+each instance fingerprints the files (inode + mtime) and reloads its
+snapshot whenever another process has flushed a newer one. Mutations hold
+an exclusive flock on a lockfile across refresh+mutate+flush, so two
+workers' overlapping writes serialize instead of the later flush silently
+reverting the earlier one.
+"""
+
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import orjson
+
+
+class EncodingStore:
+
+    def __init__(self, data_dir: str, model: str = 'large'):
+        self._matrix_path = os.path.join(data_dir, 'encodings.npy')
+        self._index_path = os.path.join(data_dir, 'users.json')
+        self._flock_path = os.path.join(data_dir, 'store.lock')
+        self._model = model
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self.user_index: Dict[str, dict] = {}
+        self._fingerprint: Optional[Tuple[int, int, int, int]] = None
+        self._reload()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        # flock serializes across worker processes; the threading.Lock held
+        # by callers only covers threads within one process
+        with open(self._flock_path, 'a+b') as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _stat(self) -> Optional[Tuple[int, int, int, int]]:
+        # os.replace allocates a new inode on every flush, so the inode pair
+        # changes even when two flushes land within one mtime clock tick
+        try:
+            m = os.stat(self._matrix_path)
+            i = os.stat(self._index_path)
+        except FileNotFoundError:
+            return None
+        return (m.st_ino, m.st_mtime_ns, i.st_ino, i.st_mtime_ns)
+
+    def _reload(self) -> None:
+        fingerprint = self._stat()
+        if fingerprint is None:
+            self._matrix = None
+            self.user_index = {}
+        else:
+            with open(self._index_path, 'rb') as f:
+                self.user_index = orjson.loads(f.read())
+            self._matrix = np.load(self._matrix_path, mmap_mode='r')
+        self._fingerprint = fingerprint
+
+    def _refresh_if_stale(self) -> None:
+        if self._stat() != self._fingerprint:
+            self._reload()
+
+    def get(self, user_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            # Shared lock so a reload can't pair one freshly renamed file
+            # with the other's old version while a writer is mid-flush;
+            # once mapped, the mmap pins its inode, so reading the returned
+            # row after the lock is released stays safe
+            with self._file_lock(exclusive=False):
+                self._refresh_if_stale()
+            entry = self.user_index.get(user_id)
+            if entry is None or self._matrix is None:
+                return None
+            return self._matrix[entry['row']]
+
+    def put(self, user_id: str, encoding: np.ndarray) -> None:
+        vec = np.ascontiguousarray(encoding, dtype=np.float32)
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh_if_stale()
+            entry = self.user_index.get(user_id)
+            if self._matrix is None:
+                matrix = vec[np.newaxis, :]
+            elif entry is None:
+                matrix = np.vstack([self._matrix, vec[np.newaxis, :]])
+            else:
+                matrix = np.array(self._matrix)
+                matrix[entry['row']] = vec
+            row = entry['row'] if entry else matrix.shape[0] - 1
+            self.user_index[user_id] = {
+                'row': row,
+                'created_at': datetime.utcnow().isoformat(),
+                'model': self._model
+            }
+            self._flush(matrix)
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh_if_stale()
+            entry = self.user_index.pop(user_id, None)
+            if entry is None:
+                return False
+            # Compact immediately; N is small enough that rewriting beats
+            # letting dead rows accumulate in the mmap
+            row = entry['row']
+            matrix = np.delete(np.array(self._matrix), row, axis=0)
+            for other in self.user_index.values():
+                if other['row'] > row:
+                    other['row'] -= 1
+            self._flush(matrix)
+            return True
+
+    def _flush(self, matrix: np.ndarray) -> None:
+        # Write-then-rename, under the caller's exclusive flock: the two
+        # renames are only consistent as a pair because readers refresh
+        # under the shared lock
+        tmp = self._matrix_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp, self._matrix_path)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(self.user_index))
+        os.replace(tmp, self._index_path)
+        self._matrix = np.load(self._matrix_path, mmap_mode='r')
+        self._fingerprint = self._stat()
@@ -0,0 +1,21 @@
+"""Build script for the optional fast_decode extension (see fast_decode.pyx)"""
+
+import numpy as np
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name='fast_decode',
+    ext_modules=cythonize(
+        [
+            Extension(
+                'fast_decode',
+                sources=['fast_decode.pyx'],
+                libraries=['turbojpeg'],
+                include_dirs=[np.get_include()],
+                define_macros=[('NPY_NO_DEPRECATED_API', 'NPY_1_7_API_VERSION')],
+            )
+        ],
+        language_level=3,
+    ),
+)
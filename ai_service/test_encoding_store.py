@@ -0,0 +1,87 @@
+"""Regression tests for EncodingStore visibility across worker processes"""
+
+import multiprocessing
+
+import numpy as np
+
+from encoding_store import EncodingStore
+
+
+def _vec(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random(128, dtype=np.float32)
+
+
+def _put_many(data_dir: str, worker: int, count: int) -> None:
+    store = EncodingStore(data_dir)
+    for i in range(count):
+        store.put(f'user-{worker}-{i}', _vec(worker * 100 + i))
+
+
+def test_put_visible_across_instances(tmp_path):
+    a = EncodingStore(str(tmp_path))
+    b = EncodingStore(str(tmp_path))
+
+    vec = _vec(1)
+    a.put('user-1', vec)
+
+    got = b.get('user-1')
+    assert got is not None
+    np.testing.assert_array_equal(np.asarray(got), vec)
+
+
+def test_delete_visible_across_instances(tmp_path):
+    a = EncodingStore(str(tmp_path))
+    b = EncodingStore(str(tmp_path))
+
+    a.put('user-1', _vec(1))
+    assert b.get('user-1') is not None
+
+    assert a.delete('user-1')
+    assert b.get('user-1') is None
+
+
+def test_stale_instance_write_keeps_other_workers_changes(tmp_path):
+    a = EncodingStore(str(tmp_path))
+    b = EncodingStore(str(tmp_path))
+
+    # b last loaded an empty directory; its put must pick up a's enroll
+    # instead of rewriting the store from the stale snapshot
+    a.put('user-1', _vec(1))
+    b.put('user-2', _vec(2))
+
+    assert a.get('user-1') is not None
+    assert a.get('user-2') is not None
+
+
+def test_overlapping_puts_across_processes_lose_nothing(tmp_path):
+    # Without the flock, two workers whose put windows overlap flush from
+    # stale snapshots and the later write drops the earlier enrollment
+    workers, count = 4, 5
+    procs = [
+        multiprocessing.Process(target=_put_many, args=(str(tmp_path), w, count))
+        for w in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    store = EncodingStore(str(tmp_path))
+    for w in range(workers):
+        for i in range(count):
+            assert store.get(f'user-{w}-{i}') is not None
+
+
+def test_delete_reindexes_remaining_rows(tmp_path):
+    store = EncodingStore(str(tmp_path))
+    vecs = {f'user-{i}': _vec(i) for i in range(3)}
+    for user_id, vec in vecs.items():
+        store.put(user_id, vec)
+
+    assert store.delete('user-1')
+
+    assert store.get('user-1') is None
+    for user_id in ('user-0', 'user-2'):
+        np.testing.assert_array_equal(np.asarray(store.get(user_id)), vecs[user_id])